@@ -11,14 +11,64 @@ Author: Samuel Wechsler
 """
 import matplotlib.pyplot as plt
 import numpy as np
-from math import pow
 import sympy as sp
+from functools import lru_cache
+
+import acid_kernel
 
 # define constants
 K_w = 10**-14
 
 
+@lru_cache(maxsize=4096)
+def _logc_cached(Kcum, C, i, pH):
+    """
+    Memoized log10 concentration of protonation state i at a single pH.
+
+    Args:
+        Kcum (tuple of float): Cumulative products of the dissociation constants, as hashable key.
+        C (float): Initial acid concentration.
+        i (int): Protonation state (0, 1, ..., n).
+        pH (float): pH value.
+
+    Returns:
+        float: Log10 concentration of the species.
+    """
+    return np.log10(C * acid_kernel.alpha(np.asarray(Kcum), i, 10.0**(-pH)))
+
+
+def batch_logc(acids, pH):
+    """
+    Calculate log10 concentrations of all protonation states of several acids at once.
+
+    Args:
+        acids (list of Acid): Acids to evaluate.
+        pH (numpy.ndarray): pH values.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(acids), m+1, len(pH)), where m is the largest
+        number of pKa values; entry [a, i] holds the log10 concentration of protonation
+        state i of acid a, NaN if acid a has fewer states.
+    """
+    n_max = max((len(acid.pKa) for acid in acids), default=0)
+
+    # pad per-acid constants to a common number of protonation states
+    logKcum = np.full((len(acids), n_max+1), -np.inf)
+    exponents = np.zeros((len(acids), n_max+1), dtype=int)
+    for a, acid in enumerate(acids):
+        logKcum[a, :len(acid.logKcum)] = acid.logKcum
+        exponents[a, :len(acid.exponents)] = acid.exponents
+    C = np.array([acid.C for acid in acids], dtype=float)
+
+    return acid_kernel.logc_batch(logKcum, exponents, C, np.asarray(pH, dtype=float))
+
+
 class Acid:
+    __slots__ = (
+        "pKa", "Ka", "C", "Kcum", "exponents", "logKcum", "_Kcum_key",
+        "name", "charge", "_labels",
+    )
+
     def __init__(self, pKa, C, name="A", charge=0):
         """
         Initialize an Acid object.
@@ -29,10 +79,17 @@ class Acid:
             name (str): name of acid.
         """
         # TODO: check if pKa is a list, etc.
-        self.pKa = pKa
-        self.Ka = [10**(-pKa[i]) for i in range(len(pKa))]
+        self.pKa = np.asarray(pKa, dtype=np.float64)
+        self.Ka = np.power(10.0, -self.pKa)
         self.C = C
 
+        # Kcum[i] is the product of the first i dissociation constants (logKcum is its log10),
+        # exponents[i] is the power of H in the term of protonation state i
+        self.Kcum = np.concatenate([[1.0], np.cumprod(self.Ka)])
+        self.exponents = np.arange(len(self.pKa), -1, -1)
+        self.logKcum = np.concatenate([[0.0], -np.cumsum(self.pKa)])
+        self._Kcum_key = tuple(self.Kcum)
+
         # check if string input is valid
         if "$" in name:
             raise Exception(
@@ -40,6 +97,9 @@ class Acid:
         self.name = name
         self.charge = charge
 
+        # species labels only depend on the above, build them once
+        self._labels = tuple(self._build_label(i) for i in range(len(self.pKa)+1))
+
     def alpha(self, i, pH):
         """
         Calculate fraction of acid dissociated at a given pH.
@@ -55,32 +115,63 @@ class Acid:
         Gambi, A., Toniolo, R. Acid–base logarithmic diagrams with computer algebra systems.
         ChemTexts 2, 9 (2016). https://doi.org/10.1007/s40828-016-0029-1
         """
-        H = 10**(-pH)
-        n = len(self.Ka)
+        self._check_state(i)
+        return acid_kernel.alpha(self.Kcum, i, 10.0**(-pH))
+
+    def alpha_vec(self, pH):
+        """
+        Calculate fractions of all protonation states over an array of pH values.
+
+        Args:
+            pH (numpy.ndarray): pH values.
+
+        Returns:
+            numpy.ndarray: Array of shape (n+1, len(pH)), where row i holds the
+            fraction of protonation state i.
+        """
+        return self.alpha_from_H(np.power(10.0, -np.asarray(pH, dtype=float)))
 
-        # calculate denominator
-        enum = pow(H, n-i)
+    def alpha_from_H(self, H):
+        """
+        Calculate fractions of all protonation states over an array of H+ concentrations.
 
-        for j in range(1, i+1):
-            enum *= self.Ka[j-1]
+        Same as `alpha_vec`, but skips the conversion from pH for callers that
+        already hold the H+ concentrations.
 
-        # calculate value of enumerator
-        denom = pow(H, n)
+        Args:
+            H (numpy.ndarray): H+ concentrations.
 
-        for k in range(1, n+1):
+        Returns:
+            numpy.ndarray: Array of shape (n+1, len(H)), where row i holds the
+            fraction of protonation state i.
+        """
+        return acid_kernel.alpha_vec(self.Kcum, H)
 
-            p = pow(H, n-k)
+    def _check_state(self, i):
+        """
+        Raise an IndexError if `i` is not a protonation state of the acid.
 
-            for k in range(1, k+1):
-                p *= self.Ka[k-1]
+        The compiled kernels don't check bounds, so this has to happen before calling them.
+        """
+        n = len(self.pKa)
+        if not 0 <= i <= n:
+            raise IndexError(f"Protonation state {i} out of range, must be between 0 and {n}.")
 
-            denom += p
+    def label(self, i):
+        """
+        Return the label of the acid species with a specific protonation state.
 
-        return enum / denom
+        Args:
+            i (int): Protonation state (0, 1, ..., n).
 
-    def __repr__(self, i):
+        Returns:
+            str: LaTeX label of the species.
         """
-        Return a representation of the acid species with a specific protonation state.
+        return self._labels[i]
+
+    def _build_label(self, i):
+        """
+        Build a representation of the acid species with a specific protonation state.
 
         Args:
             i (int): Protonation state (0, 1, ..., n).
@@ -135,4 +226,24 @@ class Acid:
         Returns:
             float: Log10 concentration of the species.
         """
-        return np.log10(self.c(i, pH))
+        self._check_state(i)
+        if np.ndim(pH) != 0:
+            return self.logc_all(pH)[i]
+        return _logc_cached(self._Kcum_key, self.C, i, float(pH))
+
+    def logc_all(self, pH):
+        """
+        Calculate log10 concentrations of all protonation states over an array of pH values.
+
+        Works in the log domain throughout, so the result stays finite at pH extremes
+        where H^n underflows.
+
+        Args:
+            pH (numpy.ndarray): pH values.
+
+        Returns:
+            numpy.ndarray: Array of shape (n+1, len(pH)), where row i holds the
+            log10 concentration of protonation state i.
+        """
+        pH = np.asarray(pH, dtype=float)
+        return acid_kernel.logc_all(self.logKcum, self.exponents, self.C, pH)
@@ -0,0 +1,173 @@
+"""
+This module contains the numeric kernels behind the `Acid` class. Keeping them in one place means there is a
+single fast path shared by every caller.
+
+`alpha` and `alpha_vec` are taken from the extension module `_acid_kernel_aot` if it has been built (see
+`build_acid_kernel_aot.py`). Otherwise they are compiled with Numba if it is installed. The compiled code is cached
+on disk, so only the very first run pays for compilation. Without Numba, plain Python/NumPy versions are used instead.
+The implementation is picked on the first kernel call, so importing this module never imports Numba.
+
+For the formula, please refer to the source:
+Gambi, A., Toniolo, R. Acid–base logarithmic diagrams with computer algebra systems.
+ChemTexts 2, 9 (2016). https://doi.org/10.1007/s40828-016-0029-1
+"""
+import numpy as np
+
+# signatures of the compiled kernels
+ALPHA_SIGNATURE = "float64(float64[:], int64, float64)"
+ALPHA_VEC_SIGNATURE = "float64[:, :](float64[:], float64[:])"
+
+
+def _alpha(Kcum, i, H):
+    """
+    Fraction of protonation state i at a single H+ concentration.
+
+    Args:
+        Kcum (numpy.ndarray): Cumulative products of the dissociation constants (see `Acid.Kcum`).
+        i (int): Protonation state (0, 1, ..., n).
+        H (float): H+ concentration.
+
+    Returns:
+        float: Fraction of protonation state i.
+    """
+    n = len(Kcum) - 1
+    denom = 0.0
+    for k in range(n + 1):
+        denom += Kcum[k] * H**(n - k)
+    return Kcum[i] * H**(n - i) / denom
+
+
+def _alpha_vec(Kcum, H):
+    """
+    Fractions of all protonation states over an array of H+ concentrations, written as loops for Numba.
+
+    Args:
+        Kcum (numpy.ndarray): Cumulative products of the dissociation constants (see `Acid.Kcum`).
+        H (numpy.ndarray): H+ concentrations.
+
+    Returns:
+        numpy.ndarray: Array of shape (n+1, len(H)).
+    """
+    n = len(Kcum) - 1
+    out = np.empty((n + 1, len(H)))
+    for j in range(len(H)):
+        denom = 0.0
+        for k in range(n + 1):
+            out[k, j] = Kcum[k] * H[j]**(n - k)
+            denom += out[k, j]
+        for k in range(n + 1):
+            out[k, j] /= denom
+    return out
+
+
+def _alpha_vec_numpy(Kcum, H):
+    """
+    Same as `_alpha_vec`, using NumPy broadcasting instead of loops.
+    """
+    exponents = np.arange(len(Kcum) - 1, -1, -1)
+
+    # terms[i] = Kcum[i] * H^(n-i), denominator is their sum
+    terms = Kcum[:, None] * np.power(H[None, :], exponents[:, None])
+    denom = terms.sum(axis=0)
+
+    return terms / denom[None, :]
+
+
+# implementations of alpha and alpha_vec, set by _load_kernels on first use
+_alpha_impl = None
+_alpha_vec_impl = None
+
+
+def _load_kernels():
+    """
+    Select the fastest available kernels: ahead-of-time compiled, JIT-compiled with Numba, or plain Python/NumPy.
+    """
+    global _alpha_impl, _alpha_vec_impl
+
+    try:
+        import _acid_kernel_aot
+    except ImportError:  # only exists after running build_acid_kernel_aot.py
+        _acid_kernel_aot = None
+
+    if _acid_kernel_aot is not None:
+        _alpha_impl = _acid_kernel_aot.alpha
+        _alpha_vec_impl = _acid_kernel_aot.alpha_vec
+        return
+
+    try:
+        import numba
+    except ImportError:  # numba is optional, fall back to plain numpy
+        numba = None
+
+    if numba is not None:
+        # explicit signatures compile both kernels right away, the result is cached on disk
+        _alpha_impl = numba.njit(ALPHA_SIGNATURE, cache=True, fastmath=True)(_alpha)
+        _alpha_vec_impl = numba.njit(ALPHA_VEC_SIGNATURE, cache=True, fastmath=True)(_alpha_vec)
+    else:
+        _alpha_impl = _alpha
+        _alpha_vec_impl = _alpha_vec_numpy
+
+
+def alpha(Kcum, i, H):
+    """
+    Fraction of protonation state i at a single H+ concentration, see `_alpha`.
+    """
+    if _alpha_impl is None:
+        _load_kernels()
+    return _alpha_impl(Kcum, i, H)
+
+
+def alpha_vec(Kcum, H):
+    """
+    Fractions of all protonation states over an array of H+ concentrations, see `_alpha_vec`.
+    """
+    if _alpha_vec_impl is None:
+        _load_kernels()
+    return _alpha_vec_impl(Kcum, H)
+
+
+def logc_all(logKcum, exponents, C, pH):
+    """
+    Log10 concentrations of all protonation states over an array of pH values.
+
+    Works in the log domain throughout, so the result stays finite at pH extremes
+    where H^n underflows.
+
+    Args:
+        logKcum (numpy.ndarray): log10 of the cumulative products of the dissociation constants.
+        exponents (numpy.ndarray): Power of H in the term of each protonation state (n, n-1, ..., 0).
+        C (float): Initial acid concentration.
+        pH (numpy.ndarray): pH values.
+
+    Returns:
+        numpy.ndarray: Array of shape (n+1, len(pH)).
+    """
+    # a single acid is a batch of one, so both share the same log-sum-exp
+    return logc_batch(logKcum[None, :], exponents[None, :], np.asarray([C], dtype=float), pH)[0]
+
+
+def logc_batch(logKcum, exponents, C, pH):
+    """
+    Log10 concentrations of all protonation states of several acids over an array of pH values.
+
+    Acids with fewer protons are padded to the largest number of protonation states: padded
+    entries have logKcum = -inf (and exponent 0), so their terms vanish from the denominator.
+
+    Args:
+        logKcum (numpy.ndarray): Padded log10 cumulative products, shape (A, m+1).
+        exponents (numpy.ndarray): Padded powers of H, shape (A, m+1).
+        C (numpy.ndarray): Initial concentrations, shape (A,).
+        pH (numpy.ndarray): pH values.
+
+    Returns:
+        numpy.ndarray: Array of shape (A, m+1, len(pH)), NaN for padded protonation states.
+    """
+    # log10 of terms[a, i] = Kcum[a, i] * H^(n_a-i)
+    log_terms = logKcum[:, :, None] - exponents[:, :, None] * pH[None, None, :]
+
+    # log-sum-exp in base 10 over the protonation states (state 0 is never padded, so shift is finite)
+    shift = log_terms.max(axis=1, keepdims=True)
+    log_denom = shift + np.log10(np.power(10.0, log_terms - shift).sum(axis=1, keepdims=True))
+
+    logc = np.log10(C)[:, None, None] + log_terms - log_denom
+    return np.where(np.isneginf(logKcum)[:, :, None], np.nan, logc)
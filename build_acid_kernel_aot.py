@@ -0,0 +1,26 @@
+"""
+This script compiles the kernels from `acid_kernel` ahead of time into the extension module `_acid_kernel_aot`.
+If that module is present, `acid_kernel` imports it instead of JIT-compiling, so even the first plot of a fresh
+process does not wait for Numba.
+
+Requires Numba and a C compiler. Run it from the repository root:
+
+    python build_acid_kernel_aot.py
+"""
+import os
+
+from numba.pycc import CC
+
+import acid_kernel
+
+
+cc = CC("_acid_kernel_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# export the undecorated kernels with the same signatures the JIT uses
+cc.export("alpha", acid_kernel.ALPHA_SIGNATURE)(acid_kernel._alpha)
+cc.export("alpha_vec", acid_kernel.ALPHA_VEC_SIGNATURE)(acid_kernel._alpha_vec)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -9,13 +9,88 @@ import seaborn as sns
 import numpy as np
 import re
 import interplot as ip
+from contextlib import contextmanager
+from functools import lru_cache
 
-from acid import Acid
+from acid import Acid, batch_logc
 
 
 PHG_LINEWIDTH = 8
 PHG_OPACITY = 0.4
 
+# tab10 only has 10 distinct colors, build the palette once and cycle through it
+_PALETTE = list(sns.color_palette("tab10", 10))
+
+# strips LaTeX markup from species labels, interactive plots can't render it
+_LABEL_CLEAN = re.compile(r'[{}_^$]?(?:\\mathrm)?')
+
+
+# default pH grid and the log[H+] / log[OH-] lines derived from it, computed once at import (never modify in place)
+_PH_DEFAULT = np.linspace(0, 14, 100)
+_LOG_H_DEFAULT = -_PH_DEFAULT
+_LOG_OH_DEFAULT = _PH_DEFAULT - 14
+
+
+def _pH_grid(pH_range):
+    """
+    Return the pH grid with the log10 of its H+ and OH- concentrations.
+
+    Args:
+        pH_range (numpy.ndarray or None): pH values, None selects the cached default grid.
+
+    Returns:
+        tuple of numpy.ndarray: pH, log[H+], log[OH-]
+    """
+    if pH_range is None:
+        return _PH_DEFAULT, _LOG_H_DEFAULT, _LOG_OH_DEFAULT
+
+    pH_range = np.asarray(pH_range, dtype=float)
+    return pH_range, -pH_range, pH_range - 14
+
+
+# coarse base of the adaptive grid, away from the pKa values all curves are straight lines
+_PH_COARSE = np.linspace(0, 14, 40)
+
+
+def _adaptive_pH_range(acids):
+    """
+    Return a pH grid from 0 to 14 that is coarse in the linear regions and dense
+    within 1.5 pH units of each pKa, where the curves bend.
+
+    Args:
+        acids (list of Acid): Acids whose pKa values are refined.
+
+    Returns:
+        numpy.ndarray: Sorted pH values.
+    """
+    if not acids:
+        return _PH_COARSE
+
+    all_pKa = np.unique(np.concatenate([acid.pKa for acid in acids]))
+    windows = [np.linspace(pKa - 1.5, pKa + 1.5, 20) for pKa in all_pKa]
+    pH_range = np.unique(np.concatenate([_PH_COARSE, *windows]))
+    return pH_range[(pH_range >= 0) & (pH_range <= 14)]
+
+
+@contextmanager
+def _ioff():
+    """
+    Temporarily turn off matplotlib's interactive mode (`plt.ioff()` is only a context manager from matplotlib 3.4 on).
+    """
+    was_interactive = plt.isinteractive()
+    plt.ioff()
+    try:
+        yield
+    finally:
+        if was_interactive:
+            plt.ion()
+
+
+@lru_cache(maxsize=None)
+def _plain_label(label):
+    """Return `label` without LaTeX markup."""
+    return _LABEL_CLEAN.sub('', label)
+
 
 def plot_sillen(
     acids,
@@ -23,7 +98,7 @@ def plot_sillen(
     phg_fine_line=False,
     half_scale=False,
     width=600,
-    pH_range=np.linspace(0, 14, 100),
+    pH_range=None,
     fig=None,
     **kwargs,
 ):
@@ -34,13 +109,18 @@ def plot_sillen(
     Args:
         pKa (list of float): List of pKa values for the acid.
         C (float): Initial acid concentration.
-        pH_range (numpy.ndarray, optional): pH values for the x-axis (default is a range from 0 to 14).
+        pH_range (numpy.ndarray, optional): pH values for the x-axis (default is a range from 0 to 14,
+            refined around the pKa values).
 
     The function generates a Sillén diagram showing the pH-dependent concentration of species with different protonation states.
     """
     if not isinstance(acids, list):
         acids = [acids]
 
+    if pH_range is None:
+        pH_range = _adaptive_pH_range(acids)
+    pH_range, log_H, log_OH = _pH_grid(pH_range)
+
     def mpl_grid(fig, ax):
         ax[0, 0].grid(True, which='major', linestyle='-',
                       linewidth=0.5, color='black')
@@ -69,52 +149,57 @@ def plot_sillen(
         **args
     )
 
-    phg_left = [10**-pH for pH in pH_range]
-    phg_right = [10**(-14 + pH) for pH in pH_range]
-
-    for acid, deprot_level in ip.zip_smart(acids, deprot_levels):
-        # create list of concentrations for each protonation state
-        for i in range(len(acid.pKa)+1):
-            logc = [acid.logc(i, pH) for pH in pH_range]
-            fig.add_line(pH_range, logc, label=(
-                re.sub(r'[{}_^$]?(:?\\mathrm)?', r'', acid.__repr__(i))
-                if fig.interactive
-                else acid.__repr__(i)
-            ))
-            if deprot_level is not None and i < deprot_level:
-                phg_left += 10**np.array(logc)
-            if deprot_level is not None and i > deprot_level:
-                phg_right += 10**np.array(logc)
-
-    if deprot_levels is not None:
-        fig.add_line(pH_range, np.log10(phg_left), label='PHG links', linewidth=PHG_LINEWIDTH, opacity=PHG_OPACITY, color="blue")
-        fig.add_line(pH_range, np.log10(phg_right), label='PHG rechts', linewidth=PHG_LINEWIDTH, opacity=PHG_OPACITY, color="red")
-        if phg_fine_line:
-            fig.add_line(pH_range, np.log10(phg_left), opacity=0.8, label=None, color="blue", line_style=":")
-            fig.add_line(pH_range, np.log10(phg_right), opacity=0.8, label=None, color="red", line_style=":")
-
-    # plot H, and OH
-    fig.add_line(
-        pH_range,
-        [-pH for pH in pH_range],
-        linewidth=0.5,
-        label='H+' if fig.interactive else '$H^+$',
-        color='black',
-    )
-    fig.add_line(
-        pH_range,
-        [-14 + pH for pH in pH_range],
-        linewidth=0.5,
-        label='OH-' if fig.interactive else '$OH^-$',
-        color='black',
-    )
-
-    fig.post_process()
+    phg_left = np.power(10.0, log_H)
+    phg_right = np.power(10.0, log_OH)
+
+    # concentrations of all acids and protonation states at once
+    logc = batch_logc(acids, pH_range)
+
+    # add all lines without intermediate redraws, fig.show() / fig.save() render the result once
+    with _ioff():
+        for a, (acid, deprot_level) in enumerate(ip.zip_smart(acids, deprot_levels)):
+            for i in range(len(acid.pKa)+1):
+                fig.add_line(pH_range, logc[a, i], label=(
+                    _plain_label(acid.label(i))
+                    if fig.interactive
+                    else acid.label(i)
+                ))
+
+            if deprot_level is not None:
+                # slice to the acid's own states, smaller acids are NaN-padded in the batch
+                c = np.power(10.0, logc[a, :len(acid.pKa)+1])
+                phg_left += c[:deprot_level].sum(axis=0)
+                phg_right += c[deprot_level+1:].sum(axis=0)
+
+        if deprot_levels is not None:
+            fig.add_line(pH_range, np.log10(phg_left), label='PHG links', linewidth=PHG_LINEWIDTH, opacity=PHG_OPACITY, color="blue")
+            fig.add_line(pH_range, np.log10(phg_right), label='PHG rechts', linewidth=PHG_LINEWIDTH, opacity=PHG_OPACITY, color="red")
+            if phg_fine_line:
+                fig.add_line(pH_range, np.log10(phg_left), opacity=0.8, label=None, color="blue", line_style=":")
+                fig.add_line(pH_range, np.log10(phg_right), opacity=0.8, label=None, color="red", line_style=":")
+
+        # plot H, and OH
+        fig.add_line(
+            pH_range,
+            log_H,
+            linewidth=0.5,
+            label='H+' if fig.interactive else '$H^+$',
+            color='black',
+        )
+        fig.add_line(
+            pH_range,
+            log_OH,
+            linewidth=0.5,
+            label='OH-' if fig.interactive else '$OH^-$',
+            color='black',
+        )
+
+        fig.post_process()
 
     return fig
 
 
-def plot_sillen_old(acids, pH_range=np.linspace(0, 14, 100)):
+def plot_sillen_old(acids, pH_range=None):
     """
     Plots Sillén diagram for acids with n dissociable protons given their respective pKa values
     and initial concentration C.
@@ -129,6 +214,8 @@ def plot_sillen_old(acids, pH_range=np.linspace(0, 14, 100)):
     if not isinstance(acids, list):
         acids = [acids]
 
+    pH_range, log_H, log_OH = _pH_grid(pH_range)
+
     # create plot
     fig, ax = plt.subplots(figsize=(8, 6))
 
@@ -138,7 +225,7 @@ def plot_sillen_old(acids, pH_range=np.linspace(0, 14, 100)):
     # Set the x and y axis limits
     ax.set_xlim(0, 14)
     ax.set_ylim(-14, 0)
-    ax.set_aspect('equal')
+    ax.set_box_aspect(1.0)
 
     # Set the grid properties
     ax.grid(True, which='major', linestyle='-',
@@ -154,24 +241,28 @@ def plot_sillen_old(acids, pH_range=np.linspace(0, 14, 100)):
     ax.set_facecolor('#f0f0f0')
 
     # Choose a color palette from Seaborn
-    colors = sns.color_palette("tab10", sum(
-        [len(acid.pKa) for acid in acids]) + 1)
+    colors = _PALETTE
 
     # # Choose the "viridis" color map from Matplotlib
     # colors = plt.cm.viridis(np.linspace(
     #     0, 1, sum([len(acid.pKa) for acid in acids]) + 1))
 
-    for acid in acids:
-        # create list of concentrations for each protonation state
-        for i in range(len(acid.pKa)+1):
-            logc = [acid.logc(i, pH) for pH in pH_range]
-            ax.plot(pH_range, logc, label=acid.__repr__(i), color=colors[i])
+    # concentrations of all acids and protonation states at once
+    logc = batch_logc(acids, pH_range)
+
+    # draw all species with a single plot call, then label and color the lines
+    species = [(a, i) for a, acid in enumerate(acids) for i in range(len(acid.pKa)+1)]
+    if species:
+        lines = ax.plot(pH_range, np.stack([logc[a, i] for a, i in species], axis=1))
+        for line, (a, i) in zip(lines, species):
+            line.set_label(acids[a].label(i))
+            line.set_color(colors[i % len(colors)])
 
     # plot H, and OH
-    ax.plot(pH_range, [-pH for pH in pH_range],
+    ax.plot(pH_range, log_H,
             linewidth=0.5, label='$H^+$', color='black')
 
-    ax.plot(pH_range, [-14 + pH for pH in pH_range], linewidth=0.5,
+    ax.plot(pH_range, log_OH, linewidth=0.5,
             label='$OH^-$', color='black')
 
     # ax.legend(loc='upper right', bbox_to_anchor=(1.1, 1), borderaxespad=0.0)